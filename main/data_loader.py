@@ -1,8 +1,22 @@
 import json
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
+import joblib
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
-from typing import Dict, Generator
+from typing import Dict, Generator, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Strips // comment lines from JSONC in a single pass over the raw bytes.
+_JSONC_COMMENT_RE = re.compile(rb"(?m)^\s*//[^\n]*")
+
+_BASE_DIR = Path(__file__).resolve().parent.parent
 
 
 class DataLoader:
@@ -15,25 +29,59 @@ class DataLoader:
     """
 
     @staticmethod
-    def stream_data(filepath: str, batch_size: int) -> Generator:
+    def stream_data(
+        filepath: str,
+        batch_size: int,
+        columns: Optional[List] = None,
+        filters=None,
+    ) -> Generator:
         """
-        Reads a Parquet file in batches and yields data as pandas DataFrames.
+        Reads a Parquet file in batches and yields Arrow RecordBatches.
+
+        Batches stay in Arrow's columnar layout; converting to pandas (and
+        its BlockManager copies) is left to callers that actually need it.
 
         Args:
             filepath (str): Path to the Parquet file.
             batch_size (int): Number of rows per batch to avoid memory overload.
+            columns (List, optional): Column names to read. Restricting the read
+                to the needed columns avoids decoding unused ones, and lets the
+                reader pre-buffer only the relevant column chunks.
+            filters (ds.Expression, optional): Predicate to push down into the
+                scan (e.g. ``ds.field("machine_id") == 3``). Row groups whose
+                statistics cannot match are skipped entirely.
 
         Yields:
-            pd.DataFrame: A batch of data as a DataFrame.
+            pa.RecordBatch: A batch of data with null rows dropped.
         """
 
         try:
-            parquet_file = pq.ParquetFile(filepath)
-
-            for batch in parquet_file.iter_batches(batch_size=batch_size):
-                df = batch.to_pandas()
-                df.dropna(inplace=True)
-                yield df
+            if filters is not None:
+                dataset = ds.dataset(filepath, format="parquet")
+                batches = dataset.to_batches(
+                    columns=columns,
+                    filter=filters,
+                    batch_size=batch_size,
+                    use_threads=True,
+                )
+            else:
+                parquet_file = pq.ParquetFile(
+                    filepath,
+                    memory_map=True,
+                    pre_buffer=True,
+                    buffer_size=1 << 20,
+                )
+                batches = parquet_file.iter_batches(
+                    batch_size=batch_size,
+                    columns=columns,
+                    use_threads=True,
+                    use_pandas_metadata=False,
+                )
+
+            for batch in batches:
+                # Drop rows with nulls on the Arrow side: one vectorized pass
+                # over the validity bitmaps instead of a per-column pandas walk.
+                yield batch.drop_null()
 
         except Exception as e:
             raise RuntimeError(f"Error reading Parquet file from {filepath}: {e}")
@@ -43,6 +91,10 @@ class DataLoader:
         """
         Loads a pre-trained model from a pickle file.
 
+        Repeated loads of the same unmodified file are served from an
+        in-process cache keyed on path and mtime, skipping disk I/O and
+        deserialization.
+
         Args:
             filepath (str): Path to the model file.
 
@@ -50,25 +102,40 @@ class DataLoader:
             object: A scikit-learn model loaded from the pickle file.
         """
         try:
-            current_script_dir = os.path.dirname(os.path.abspath(__file__))
-            base_dir = os.path.dirname(current_script_dir)
-            model_path = Path(filepath)
-            full_model_path = base_dir / model_path
-
-            with open(full_model_path, "rb") as model_file:
-                import pickle
-
-                model = pickle.load(model_file)
-            return model
+            full_model_path = _BASE_DIR / filepath
+            return DataLoader._load_model_cached(
+                str(full_model_path), os.path.getmtime(full_model_path)
+            )
 
         except Exception as e:
             raise RuntimeError(f"Error loading model from {filepath}: {e}")
 
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _load_model_cached(path: str, mtime: float) -> object:
+        """
+        Deserializes the model pickle; cached on (path, mtime).
+
+        joblib memory-maps the model's NumPy arrays read-only, so worker
+        processes share the pages instead of each holding a private copy.
+
+        Args:
+            path (str): Absolute path to the model file.
+            mtime (float): Modification time of the file, for cache keying.
+
+        Returns:
+            object: The deserialized model.
+        """
+        return joblib.load(path, mmap_mode="r")
+
     @staticmethod
     def load_pipeline_file(filepath: str) -> Dict:
         """
         Loads a pipeline configuration from a JSONC file.
 
+        Re-parses are served from an in-process cache keyed on path and
+        mtime; callers receive a fresh top-level dict they may mutate.
+
         Args:
             filepath (str): Path to the pipeline JSONC file.
 
@@ -76,15 +143,35 @@ class DataLoader:
             Dict: A dictionary containing the pipeline configuration.
         """
         try:
-            with open(filepath, "r") as file:
-                lines = [
-                    line
-                    for line in file.readlines()
-                    if not line.strip().startswith("//")
-                ]
-                pipeline_spec = json.loads("\n".join(lines))
-                steps_config = pipeline_spec.get("steps", {})
-            return steps_config
+            path = os.path.abspath(filepath)
+            steps_config = DataLoader._load_pipeline_cached(
+                path, os.path.getmtime(path)
+            )
+            return dict(steps_config)
 
         except Exception as e:
             raise RuntimeError(f"Error building pipeline from {filepath}: {e}")
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _load_pipeline_cached(path: str, mtime: float) -> Dict:
+        """
+        Parses the JSONC pipeline file; cached on (path, mtime).
+
+        Args:
+            path (str): Absolute path to the pipeline file.
+            mtime (float): Modification time of the file, for cache keying.
+
+        Returns:
+            Dict: The "steps" section of the pipeline specification.
+        """
+        with open(path, "rb") as file:
+            raw = file.read()
+
+        cleaned = _JSONC_COMMENT_RE.sub(b"", raw)
+        if orjson is not None:
+            pipeline_spec = orjson.loads(cleaned)
+        else:
+            pipeline_spec = json.loads(cleaned)
+
+        return pipeline_spec.get("steps", {})
@@ -1,4 +1,5 @@
 import logging
+import sys
 from datetime import datetime
 
 
@@ -6,20 +7,37 @@ class Logger:
     """
     This module provides a customizable logging utility with colorized console output.
     It logs messages to both a file (named with the current date) and the console.
+
+    The class is a singleton: every Logger() call returns the same configured
+    instance, so the root logger is configured once and the log file is opened
+    once instead of per consumer. Colorization is skipped when stderr is not
+    a terminal.
     """
-    def __init__(self):
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._configure()
+        return cls._instance
+
+    def _configure(self):
         today_date = datetime.now().strftime("%Y-%m-%d")
         self.log_file = f"logs/log-{today_date}.log"
+        self._color_enabled = sys.stderr.isatty()
 
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-            handlers=[logging.FileHandler(self.log_file), logging.StreamHandler()],
-        )
+        if not logging.getLogger().handlers:
+            logging.basicConfig(
+                level=logging.INFO,
+                format="%(asctime)s - %(levelname)s - %(message)s",
+                handlers=[logging.FileHandler(self.log_file), logging.StreamHandler()],
+            )
 
-    @staticmethod
-    def _colorize(text, color_code):
+    def _colorize(self, text, color_code):
         """Helper function to add color to text."""
+        if not self._color_enabled:
+            return text
         return f"\033[{color_code}m{text}\033[0m"
 
     def log_success(self, message):
@@ -37,4 +55,3 @@ class Logger:
     def log_warning(self, message):
         colored_message = self._colorize(f"WARNING: {message}", "33")  # Orange
         logging.warning(colored_message)
-
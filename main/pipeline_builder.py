@@ -1,5 +1,6 @@
 import importlib
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
 from logger import Logger
 
 from sklearn.pipeline import Pipeline
@@ -19,9 +20,51 @@ class PipelineBuilder:
         self.pipeline_config = None
         self.logger = Logger()
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _sklearn_modules() -> Tuple:
+        """
+        Imports the configured sklearn modules once and caches the result.
+
+        Returns:
+            Tuple: The imported module objects, in configuration order.
+        """
+        try:
+            module_names = config(
+                "SKLEARN_MODULES",
+                default="sklearn.preprocessing,sklearn.feature_selection,sklearn.decomposition,sklearn.ensemble",
+            ).split(",")
+
+        except UndefinedValueError:
+            raise ValueError("No sklearn modules for pipeline found on .env file.")
+
+        return tuple(importlib.import_module(name.strip()) for name in module_names)
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _class_index() -> Dict:
+        """
+        Builds a {class name: class} index over the configured modules.
+
+        Walking each module's public API once turns step resolution into a
+        single dict lookup instead of an exception-driven getattr cascade.
+        Modules are visited in reverse so earlier ones win name collisions,
+        preserving the configured search order.
+
+        Returns:
+            Dict: Mapping of class name to class object.
+        """
+        index = {}
+        for module in reversed(PipelineBuilder._sklearn_modules()):
+            for name in getattr(module, "__all__", dir(module)):
+                obj = getattr(module, name, None)
+                if isinstance(obj, type):
+                    index[name] = obj
+        return index
+
     def _instantiate_step(self, step_name: str, step_params: Dict) -> tuple:
         """
-        Dynamically imports and instantiates a scikit-learn transformer.
+        Instantiates a scikit-learn transformer from the class index.
 
         Args:
             step_name (str): The name of the pipeline step.
@@ -35,28 +78,16 @@ class PipelineBuilder:
             are not displayed in the logs by default. To address this, we explicitly log the parameters.
         """
         try:
-            sklearn_modules = config(
-                "SKLEARN_MODULES",
-                default="sklearn.preprocessing,sklearn.feature_selection,sklearn.decomposition,sklearn.ensemble",
-            ).split(",")
-
-        except UndefinedValueError:
-            raise ValueError("No sklearn modules for pipeline found on .env file.")
-
-        try:
+            class_index = self._class_index()
             for class_name, params in step_params.items():
-                for module_name in sklearn_modules:
-                    try:
-                        module = importlib.import_module(module_name)
-                        cls = getattr(module, class_name)
-                        self.logger.log_info(
-                            f"Instantiating {class_name} with params: {params}"
-                        )
-                        return step_name, cls(**params)
-                    except (ModuleNotFoundError, AttributeError):
-                        continue
-
-                raise ValueError(f"Unsupported or missing step: {class_name}")
+                cls = class_index.get(class_name)
+                if cls is None:
+                    raise ValueError(f"Unsupported or missing step: {class_name}")
+
+                self.logger.log_info(
+                    f"Instantiating {class_name} with params: {params}"
+                )
+                return step_name, cls(**params)
 
         except Exception as e:
             raise RuntimeError(f"Error while trying to instantiate pipeline step: {e}")